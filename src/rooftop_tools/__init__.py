@@ -2,6 +2,7 @@
 
 from . import points, merging, s2
 from .points import (
+    clear_snap_cache,
     gen_map_link,
     gen_directions_link,
     get_nearest_points_on_road,
@@ -24,7 +25,7 @@ __all__ = [
     "points",
     "merging",
     "s2",
-    "generate_colormap",
+    "clear_snap_cache",
     "gen_map_link",
     "gen_directions_link",
     "get_nearest_points_on_road",
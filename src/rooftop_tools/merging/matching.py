@@ -1,16 +1,50 @@
 """Matching rooftops to geographic boundaries."""
 
+import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
+import shapely
 
 from ..s2.coverage import get_s2_cells_covering_geodataframe
-from ..s2.geometry import get_s2_cell_polygon
+from ..s2.geometry import get_s2_cell_polygon, get_s2_cell_polygons
+
+
+def _read_s2_rooftops(
+    s2_rooftops_path: Path,
+    columns: list[str] | None = None,
+    bbox: tuple[float, float, float, float] | None = None,
+) -> gpd.GeoDataFrame:
+    """
+    Read an S2 rooftop parquet file, optionally loading only some of its columns.
+
+    The file's geometry column is always loaded, even if it is not listed in columns.
+    If bbox is given and the file stores a GeoParquet bbox covering column, only the
+    rooftops whose bounding boxes intersect bbox are read; files without one are
+    read in full.
+    """
+    geo_metadata = json.loads(pq.read_schema(s2_rooftops_path).metadata[b"geo"])
+    geometry_column = geo_metadata["primary_column"]
+    if columns is not None and geometry_column not in columns:
+        columns = [*columns, geometry_column]
+
+    # geopandas can only filter on bbox using the covering column
+    if "covering" not in geo_metadata["columns"][geometry_column]:
+        bbox = None
+
+    return gpd.read_parquet(s2_rooftops_path, columns=columns, bbox=bbox)
 
 
 def match_s2_rooftops_to_psus(
-    s2_file_dir: Path, s2_cell_id: int, psu_boundaries_gdf: gpd.GeoDataFrame
+    s2_file_dir: Path,
+    s2_cell_id: int,
+    psu_boundaries_gdf: gpd.GeoDataFrame,
+    columns: list[str] | None = None,
 ) -> gpd.GeoDataFrame:
     """
     Match rooftops from an S2 cell file to PSU boundaries using spatial join.
@@ -23,27 +57,53 @@ def match_s2_rooftops_to_psus(
     - s2_file_dir (Path): Directory containing S2 rooftop parquet files (named {cell_id}.parquet)
     - s2_cell_id (int): S2 cell ID to load rooftops from
     - psu_boundaries_gdf (gpd.GeoDataFrame): GeoDataFrame with PSU boundary polygons and metadata
+    - columns (list[str] | None): Rooftop columns to load from the S2 file (default=None,
+                                  all columns). The geometry column is always loaded.
 
     Returns:
     - gpd.GeoDataFrame: Rooftop centroids with PSU metadata columns joined from psu_boundaries_gdf.
                         Only includes rooftops that fall within a PSU boundary.
     """
 
-    # load the rooftops data for the S2 cell
+    # filter the boundaries dataset to only the shapes that overlap the S2 cell,
+    # using the (cached) spatial index rather than testing every boundary. The
+    # cell polygon is memoized, so preparing it once speeds up every later
+    # intersects test against it.
+    s2_cell_polygon = get_s2_cell_polygon(s2_cell_id)
+    shapely.prepare(s2_cell_polygon)
+    overlap_idx = psu_boundaries_gdf.sindex.query(
+        s2_cell_polygon, predicate="intersects"
+    )
+    psu_boundaries_gdf_s2_overlap = psu_boundaries_gdf.iloc[np.sort(overlap_idx)]
+    min_x, min_y, max_x, max_y = psu_boundaries_gdf_s2_overlap.total_bounds
+
+    # load the rooftops data for the S2 cell, skipping rooftops outside the
+    # bounding box of the overlapping PSUs where the file allows it
     s2_rooftops_path = s2_file_dir / f"{s2_cell_id}.parquet"
-    s2_rooftops_gdf = gpd.read_parquet(s2_rooftops_path)
+    s2_rooftops_gdf = _read_s2_rooftops(
+        s2_rooftops_path, columns, bbox=(min_x, min_y, max_x, max_y)
+    )
 
-    # replace polygons with just the centroid of the rooftops
+    # replace polygons with just the centroid of the rooftops, computed in a
+    # single vectorized call on the geometry array
+    centroids = shapely.centroid(s2_rooftops_gdf.geometry.values)
+
+    # drop rooftops whose centroid is outside the bounding box of the overlapping
+    # PSUs with a cheap coordinate comparison, so the spatial join only sees
+    # candidates (the file filter also keeps rooftops that just reach into it).
+    # Filtering before swapping in the centroids avoids copying dropped rows.
+    x, y = shapely.get_x(centroids), shapely.get_y(centroids)
+    in_bounds = (x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)
+    s2_rooftops_gdf = s2_rooftops_gdf[in_bounds]
     s2_rooftop_centroids_gdf = s2_rooftops_gdf.set_geometry(
-        s2_rooftops_gdf.geometry.centroid
+        gpd.GeoSeries(
+            centroids[in_bounds],
+            index=s2_rooftops_gdf.index,
+            crs=s2_rooftops_gdf.crs,
+            name=s2_rooftops_gdf.geometry.name,
+        )
     )
 
-    # filter the boundaries dataset to only the shapes that overlap the S2 cell
-    s2_cell_polygon = get_s2_cell_polygon(s2_cell_id)
-    psu_boundaries_gdf_s2_overlap = psu_boundaries_gdf[
-        psu_boundaries_gdf.intersects(s2_cell_polygon)
-    ]
-
     # perform a spatial join to filter and add area metadata to the rooftops
     matched_rooftop_centroids_gdf = gpd.sjoin(
         s2_rooftop_centroids_gdf,
@@ -56,19 +116,29 @@ def match_s2_rooftops_to_psus(
 
 
 def match_all_rooftops_to_psus(
-    s2_file_dir: Path, psu_boundaries_gdf: gpd.GeoDataFrame, level: int = 6
+    s2_file_dir: Path,
+    psu_boundaries_gdf: gpd.GeoDataFrame,
+    level: int = 6,
+    max_workers: int | None = None,
+    columns: list[str] | None = None,
 ) -> gpd.GeoDataFrame:
     """
     Match all rooftops from an S2 folder to PSU boundaries.
 
     This function determines which S2 cells are needed to cover the PSU boundaries,
     verifies that all required S2 parquet files exist, then matches rooftops from
-    all S2 cells to the PSU boundaries and combines the results.
+    all S2 cells to the PSU boundaries in parallel worker processes and combines
+    the results.
 
     Parameters:
     - s2_file_dir (Path): Directory containing S2 rooftop parquet files (named {cell_id}.parquet)
     - psu_boundaries_gdf (gpd.GeoDataFrame): GeoDataFrame with PSU boundary polygons and metadata
     - level (int): S2 cell level (default=6). Must match the level used in the S2 file naming.
+    - max_workers (int | None): Number of worker processes (default=None, one per CPU).
+                                Each worker loads a full S2 parquet file, so lower this
+                                if the S2 files are large relative to available memory.
+    - columns (list[str] | None): Rooftop columns to load from the S2 files (default=None,
+                                  all columns). The geometry column is always loaded.
 
     Returns:
     - gpd.GeoDataFrame: Combined rooftop centroids from all S2 cells with PSU metadata.
@@ -102,15 +172,37 @@ def match_all_rooftops_to_psus(
 
     print(f"All required S2 files found. Processing {len(required_s2_cells)} cells...")
 
+    # Find the PSUs overlapping every S2 cell with a single query of the PSU
+    # spatial index, and only send each worker the PSUs that overlap its S2 cell
+    # to keep the data pickled to the worker processes small. Cells without any
+    # overlapping PSUs cannot produce matches, so their files are not read at all.
+    s2_cell_polygons = np.asarray(get_s2_cell_polygons(required_s2_cells).geometry)
+    shapely.prepare(s2_cell_polygons)
+    cell_idx, psu_idx = psu_boundaries_gdf.sindex.query(
+        s2_cell_polygons, predicate="intersects"
+    )
+    s2_cell_ids = []
+    psu_boundaries_subsets = []
+    for i, s2_cell_id in enumerate(required_s2_cells):
+        overlap_idx = np.sort(psu_idx[cell_idx == i])
+        if len(overlap_idx) > 0:
+            s2_cell_ids.append(s2_cell_id)
+            psu_boundaries_subsets.append(psu_boundaries_gdf.iloc[overlap_idx])
+
     # Match rooftops from each S2 cell to PSU boundaries
     results = []
-    for s2_cell_id in required_s2_cells:
-        print(f"Processing s2 file {s2_cell_id}")
-        matched_rooftops = match_s2_rooftops_to_psus(
-            s2_file_dir, s2_cell_id, psu_boundaries_gdf
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        matches = executor.map(
+            match_s2_rooftops_to_psus,
+            repeat(s2_file_dir),
+            s2_cell_ids,
+            psu_boundaries_subsets,
+            repeat(columns),
         )
-        if len(matched_rooftops) > 0:
-            results.append(matched_rooftops)
+        for s2_cell_id, matched_rooftops in zip(s2_cell_ids, matches):
+            print(f"Processed s2 file {s2_cell_id}")
+            if len(matched_rooftops) > 0:
+                results.append(matched_rooftops)
 
     # Combine all results
     if len(results) == 0:
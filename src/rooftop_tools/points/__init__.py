@@ -1,6 +1,7 @@
 """Road snapping operations using Google Roads API."""
 
 from .snapping import (
+    clear_snap_cache,
     get_nearest_points_on_road,
     get_nearest_points_on_road_api_call,
 )
@@ -10,6 +11,7 @@ from .links import (
     gen_directions_link,
 )
 __all__ = [
+    "clear_snap_cache",
     "get_nearest_points_on_road",
     "get_nearest_points_on_road_api_call",
     "gen_map_link",
@@ -1,16 +1,122 @@
 """Snapping points to roads using the Google Roads API."""
 
 import os
-from concurrent.futures import ThreadPoolExecutor
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import geopandas as gpd
+import numpy as np
 import requests
+import shapely
+from requests.adapters import HTTPAdapter
 from shapely import Point
 from tqdm.notebook import tqdm
 
+from ..s2.geometry import _lat_lng_to_s2_cell_ids
+
+_ROADS_API_URL = "https://roads.googleapis.com/v1/nearestRoads"
+
+# (connect, read) timeouts in seconds, so a stalled request can't block a worker
+_REQUEST_TIMEOUT = (3.05, 10)
+
+# Rate-limited and transient server errors are retried with exponential backoff
+_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+_MAX_ATTEMPTS = 4
+_MAX_BACKOFF = 30
+
+# Snapped locations keyed by (x, y) rounded to _CACHE_DECIMALS (~0.1 m), so
+# repeated locations are only sent to the (paid) Roads API once per session.
+# Kept in memory only: Google's terms restrict long-term caching of results.
+# Use clear_snap_cache() to free it or to force locations to be re-snapped.
+_CACHE_DECIMALS = 6
+_SNAP_CACHE: dict[tuple[float, float], Point | None] = {}
+
+# Default session for standalone API calls, so that consecutive calls reuse
+# open connections to the Roads API
+_SESSION = requests.Session()
+
+
+def clear_snap_cache() -> None:
+    """
+    Clear the in-memory cache of snapped locations.
+
+    get_nearest_points_on_road keeps every location it snaps for the rest of the
+    session. Clear the cache to free that memory, or to send locations that were
+    already snapped to the Roads API again.
+    """
+    _SNAP_CACHE.clear()
+
+
+def _snap_coordinates_to_road(
+    coords: np.ndarray, api_key: str, session: requests.Session | None = None
+) -> list[Point | None]:
+    """
+    Send one Roads API request for an (N, 2) array of lng/lat coordinates.
+
+    Requests that are rate limited or hit a transient server error are retried up
+    to _MAX_ATTEMPTS times. Points are only created for the snapped locations in
+    the response.
+
+    Raises:
+        requests.HTTPError: If the request still fails after all retries.
+    """
+    if session is None:
+        session = _SESSION
+
+    # Format: points=lat1,lng1|lat2,lng2|... with 7 decimals (~1 cm), which
+    # keeps the query string short compared to full float repr
+    points_param = "|".join([f"{y:.7f},{x:.7f}" for x, y in coords.tolist()])
+    params = {"points": points_param, "key": api_key}
+    for attempt in range(_MAX_ATTEMPTS):
+        response = session.get(_ROADS_API_URL, params=params, timeout=_REQUEST_TIMEOUT)
+        if (
+            response.status_code not in _RETRY_STATUS_CODES
+            or attempt == _MAX_ATTEMPTS - 1
+        ):
+            break
+        # Jitter keeps parallel workers from retrying in lockstep
+        time.sleep(min(2**attempt + random.random(), _MAX_BACKOFF))
+    if not response.ok:
+        # Don't use raise_for_status, whose message includes the URL and API key
+        raise requests.HTTPError(
+            f"Roads API request failed with status {response.status_code}",
+            response=response,
+        )
+    snapped_points = response.json().get("snappedPoints", [])
+
+    # Place each snapped Point at its originalIndex, None for points not found
+    result: list[Point | None] = [None] * len(coords)
+    for entry in snapped_points:
+        idx = entry.get("originalIndex")
+        if (
+            idx is not None and result[idx] is None
+        ):  # Avoid overwriting if index already exists
+            loc = entry["location"]
+            result[idx] = Point(loc["longitude"], loc["latitude"])
+
+    return result
+
+
+def _get_point_coordinates(points) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the positions and (N, 2) x/y coordinates of the points that can be snapped.
+
+    Empty points, and points with NaN or infinite coordinates (e.g. from missing
+    lat/lon values in gpd.points_from_xy), have no location and are left out.
+    """
+    points = np.asarray(points, dtype=object)
+    valid_idx = np.flatnonzero(~shapely.is_empty(points))
+    valid_points = points[valid_idx]
+    coords = np.column_stack([shapely.get_x(valid_points), shapely.get_y(valid_points)])
+    is_finite = np.isfinite(coords).all(axis=1)
+    return valid_idx[is_finite], coords[is_finite]
+
 
 def get_nearest_points_on_road_api_call(
-    points: list[Point], api_key: str | None = None
+    points: list[Point],
+    api_key: str | None = None,
+    session: requests.Session | None = None,
 ) -> list[Point | None]:
     """
     Retrieves the nearest points on the road for a list of points using the Google Roads API.
@@ -20,12 +126,20 @@ def get_nearest_points_on_road_api_call(
         points (list[Point]): The points for which to find the nearest point on the road.
         api_key (str | None): Your Google Roads API key. If None, reads from
             GOOGLE_MAPS_API_KEY environment variable.
+        session (requests.Session | None): Session used to send the request, so that
+            repeated calls can reuse open connections. If None, a module-level
+            session is used.
 
     Returns:
-        list[Point | None]: List of snapped points (None if not found).
+        list[Point | None]: List of snapped points (None if not found, or if the point is
+            empty or has non-finite coordinates).
 
     Raises:
         ValueError: If API key is not provided and not found in environment.
+        requests.HTTPError: If the API still returns an error status after
+            retrying rate-limited and transient server errors.
+        requests.Timeout: If the API does not respond within the request timeout.
+        requests.ConnectionError: If the API cannot be reached.
     """
     # Get API key from environment if not provided
     if api_key is None:
@@ -45,36 +159,40 @@ def get_nearest_points_on_road_api_call(
         if not isinstance(pt, Point):
             raise ValueError("All points must be of type shapely.geometry.Point")
 
-    # Format: points=lat1,lng1|lat2,lng2|...
-    points_param = "|".join(f"{pt.y},{pt.x}" for pt in points)
-    url = f"https://roads.googleapis.com/v1/nearestRoads?points={points_param}&key={api_key}"
-    response = requests.get(url)
-    snapped_points = response.json().get("snappedPoints", [])
+    # Empty and non-finite points have no location to snap, so they are not
+    # sent to the API
+    result: list[Point | None] = [None] * len(points)
+    valid_idx, coords = _get_point_coordinates(points)
+    if len(valid_idx) > 0:
+        snapped_points = _snap_coordinates_to_road(coords, api_key, session)
+        for idx, snapped_point in zip(valid_idx.tolist(), snapped_points):
+            result[idx] = snapped_point
 
-    # Map originalIndex to snapped Point
-    snapped_dict = {}
-    for entry in snapped_points:
-        idx = entry.get("originalIndex")
-        if (
-            idx is not None and idx not in snapped_dict
-        ):  # Avoid overwriting if index already exists
-            loc = entry["location"]
-            snapped_dict[idx] = Point(loc["longitude"], loc["latitude"])
-
-    # Build result in original order, None for points not found
-    return [snapped_dict.get(i, None) for i in range(len(points))]
+    return result
 
 
 def _get_nearest_points_on_road_api_call_helper(args):
-    """Helper function to snap a batch of points to the nearest road."""
-    idx_list, points, api_key = args
+    """
+    Helper function to snap a batch of point coordinates to the nearest road.
+
+    Successful results are added to the snapping cache; failed batches are not.
+    """
+    idx_list, coords, api_key, session = args
     try:
-        snapped_points = get_nearest_points_on_road_api_call(points, api_key)
-        return list(zip(idx_list, snapped_points))
+        snapped_points = _snap_coordinates_to_road(coords, api_key, session)
     except Exception as e:
-        print(f"Error snapping points at indices {idx_list}: {str(e)}")
+        # requests' error messages can include the request URL, and with it the
+        # API key, so only report the type of error and any HTTP status
+        reason = type(e).__name__
+        if isinstance(e, requests.HTTPError) and e.response is not None:
+            reason += f" (status {e.response.status_code})"
+        print(f"Error snapping a batch of {len(idx_list)} points: {reason}")
         return [(idx, None) for idx in idx_list]
 
+    for (x, y), snapped_point in zip(coords.tolist(), snapped_points):
+        _SNAP_CACHE[(x, y)] = snapped_point
+    return list(zip(idx_list, snapped_points))
+
 
 def get_nearest_points_on_road(
     gdf: gpd.GeoDataFrame, api_key: str | None = None, max_workers: int = 12
@@ -82,6 +200,10 @@ def get_nearest_points_on_road(
     """
     Snap all points in a GeoDataFrame to the nearest road using parallel processing and batching.
 
+    Points at the same location (to 6 decimal places) are only sent to the API once,
+    and locations already snapped earlier in the session are served from memory.
+    Empty points and points with NaN or infinite coordinates are not sent to the API.
+
     Args:
         gdf: GeoDataFrame containing point geometries
         api_key: Google Roads API key. If None, reads from GOOGLE_MAPS_API_KEY environment variable.
@@ -89,7 +211,7 @@ def get_nearest_points_on_road(
 
     Returns:
         GeoSeries with snapped geometries (order matches input). NOTE: If any point could not be snapped,
-        the corresponding entry will be None.
+        or is empty or has non-finite coordinates, the corresponding entry will be None.
 
     Raises:
         ValueError: If API key is not provided and not found in environment.
@@ -103,37 +225,69 @@ def get_nearest_points_on_road(
                 "GOOGLE_MAPS_API_KEY environment variable"
             )
 
-    # Ensure the GeoDataFrame contains only Point geometries
-    if not all(gdf.geometry.type == "Point"):
+    # Ensure the GeoDataFrame contains only Point geometries (type id 0)
+    if not (shapely.get_type_id(gdf.geometry.values) == 0).all():
         raise ValueError("GeoDataFrame must contain only Point geometries.")
 
-    points = list(gdf.geometry)
+    # Empty and non-finite points have no location to snap, so they are left out
+    # of the API requests and resolve to None
+    geoms = np.asarray(gdf.geometry.values)
+    valid_idx, coords = _get_point_coordinates(geoms)
+
+    # Work on the coordinate array rather than a list of shapely Points, and
+    # only look up each distinct location once
+    coords = np.round(coords, _CACHE_DECIMALS)
+    unique_coords, inverse = np.unique(coords, axis=0, return_inverse=True)
+    unique_keys = [(x, y) for x, y in unique_coords.tolist()]
+
+    # Reuse locations snapped by earlier calls, and only request the rest
+    snapped_points = [_SNAP_CACHE.get(key) for key in unique_keys]
+    missing_idx = [i for i, key in enumerate(unique_keys) if key not in _SNAP_CACHE]
+
+    # Order the points along the S2 curve, so that each batch holds nearby points
+    missing_coords = unique_coords[missing_idx]
+    sort_keys = _lat_lng_to_s2_cell_ids(missing_coords[:, 1], missing_coords[:, 0], 30)
+    missing_idx = [missing_idx[i] for i in np.argsort(sort_keys, kind="stable")]
     batch_size = 100  # Google Roads API supports a maximum of 100 points per request
-    args_list = []
-    for i in range(0, len(points), batch_size):
-        idx_list = list(range(i, min(i + batch_size, len(points))))
-        batch_points = points[i : i + batch_size]
-        args_list.append((idx_list, batch_points, api_key))
-
-    snapped_points = {}
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        results = list(
-            tqdm(
-                executor.map(_get_nearest_points_on_road_api_call_helper, args_list),
-                total=len(args_list),
-                desc="Snapping points to roads (batched)",
-            )
-        )
 
-    # Flatten results and fill snapped_points dict
+    # Share one session across all worker threads so that batches reuse open
+    # connections to the Roads API instead of each doing a new TLS handshake.
+    # The default pool keeps only 10 connections, so size it to the number of
+    # workers; retries are handled in _snap_coordinates_to_road.
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        session.mount("https://", adapter)
+        args_list = []
+        for i in range(0, len(missing_idx), batch_size):
+            idx_list = missing_idx[i : i + batch_size]
+            batch_coords = unique_coords[idx_list]
+            args_list.append((idx_list, batch_coords, api_key, session))
+
+        # Collect batches as they finish, so one slow batch doesn't hold up
+        # the progress bar; a batch that keeps failing resolves to None values
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_get_nearest_points_on_road_api_call_helper, args)
+                for args in args_list
+            ]
+            results = [
+                future.result()
+                for future in tqdm(
+                    as_completed(futures),
+                    total=len(futures),
+                    desc="Snapping points to roads (batched)",
+                )
+            ]
+
+    # Flatten results into the list of snapped unique locations
     for batch in results:
         for idx, snapped_point in batch:
             snapped_points[idx] = snapped_point
 
-    # Ensure output order matches input
-    snapped_points_series = gpd.GeoSeries(
-        [snapped_points.get(i, None) for i in range(len(points))], index=gdf.index
-    )
+    # Map each input point back to its location; output order matches input
+    result: list[Point | None] = [None] * len(geoms)
+    for idx, i in zip(valid_idx.tolist(), inverse.tolist()):
+        result[idx] = snapped_points[i]
+    snapped_points_series = gpd.GeoSeries(result, index=gdf.index)
 
     return snapped_points_series
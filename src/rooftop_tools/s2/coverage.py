@@ -1,42 +1,154 @@
 """S2 cell coverage calculation for geographic areas."""
 
+import warnings
+
 import geopandas as gpd
-from s2cell.s2cell import lat_lon_to_cell_id
+import numpy as np
+import s2sphere
+import shapely
+
+from .geometry import _lat_lng_to_s2_cell_ids, get_s2_cell_polygons
 
-from .geometry import get_s2_cell_polygons
+# Leftover parts smaller than this (in square degrees, roughly 10 m^2 at the
+# equator) are floating point slivers along cell edges rather than real gaps
+_MIN_LEFTOVER_AREA = 1e-9
 
 
 def get_s2_cells_containing_points(points, level=6) -> list[int]:
     """
     Find unique S2 cell IDs that contain the given points.
 
-    For each point in the GeoDataFrame, this function identifies which S2 cell
-    contains that point at the specified level and returns the unique set of
-    cell IDs. Multiple points may fall within the same cell.
-
-    This is a helper function used by get_s2_cells_covering_geodataframe() to
-    identify initial candidate cells based on geometry centroids.
+    For each point, this function identifies which S2 cell contains that point at
+    the specified level and returns the unique set of cell IDs. Multiple points may
+    fall within the same cell.
 
     Parameters:
-    - points: GeoDataFrame with point geometries in WGS84 (EPSG:4326) CRS
+    - points: GeoDataFrame or GeoSeries with point geometries in WGS84 (EPSG:4326) CRS,
+              or an (N, 2) array of WGS84 longitude/latitude coordinates
     - level: S2 cell level (default=6, which is used for India; other countries typically
              require different levels). Higher levels = smaller cells
 
     Returns:
-    - list[int]: List of unique S2 cell IDs containing the input points
+    - list[int]: List of unique S2 cell IDs containing the input points. Empty points
+                 have no location and do not contribute a cell.
 
     Raises:
-    - ValueError: If GeoDataFrame is not in EPSG:4326 CRS
+    - TypeError: If points is not a GeoDataFrame, GeoSeries or numpy array
+    - ValueError: If the GeoDataFrame or GeoSeries is not in EPSG:4326 CRS or contains
+                  non-Point geometries, or if the array is not of shape (N, 2)
     """
-    # check if crs is set to WGS84 (EPSG:4326)
-    if points.crs is None or points.crs.to_string() != "EPSG:4326":
-        raise ValueError("Points GeoDataFrame must be in WGS84 (EPSG:4326) CRS.")
+    if isinstance(points, np.ndarray):
+        # coordinate arrays carry no CRS, so they are taken to be lng/lat already
+        if points.ndim != 2 or points.shape[1] != 2:
+            raise ValueError(
+                "Point coordinates must be an (N, 2) array of longitude/latitude."
+            )
+        coords = points
+    elif isinstance(points, (gpd.GeoDataFrame, gpd.GeoSeries)):
+        # check if crs is set to WGS84 (EPSG:4326)
+        if points.crs is None or not points.crs.equals("EPSG:4326"):
+            raise ValueError("Points GeoDataFrame must be in WGS84 (EPSG:4326) CRS.")
+
+        # Ensure the points are all Point geometries (type id 0)
+        geoms = np.asarray(points.geometry.values)
+        if not (shapely.get_type_id(geoms) == 0).all():
+            raise ValueError("Points GeoDataFrame must contain only Point geometries.")
+        coords = shapely.get_coordinates(geoms)
+    else:
+        raise TypeError(
+            "points must be a GeoDataFrame, GeoSeries or (N, 2) array of coordinates."
+        )
+
+    # convert all points to S2 cell IDs in a single vectorized pass
+    s2_cell_id_array = _lat_lng_to_s2_cell_ids(coords[:, 1], coords[:, 0], level)
+    s2_cell_ids = np.unique(s2_cell_id_array).tolist()
+
+    return s2_cell_ids
+
+
+def _subtract_s2_cells(shapes, s2_cell_shapes):
+    """
+    Remove the area covered by S2 cells from each shape.
+
+    Each shape is only differenced against the cells that actually intersect it
+    (found with an STRtree), rather than against the union of every cell.
+
+    Parameters:
+    - shapes: GeoSeries of geometries to subtract the S2 cells from
+    - s2_cell_shapes: GeoDataFrame of S2 cell polygons
+
+    Returns:
+    - GeoSeries: The non-empty leftover parts of shapes, keeping their original index
+    """
+    geoms = np.asarray(shapes.values)
+    cell_polygons = np.asarray(s2_cell_shapes.geometry.values)
+
+    tree = shapely.STRtree(cell_polygons)
+    shape_idx, cell_idx = tree.query(geoms, predicate="intersects")
+
+    leftover = geoms.copy()
+    if len(shape_idx) > 0:
+        # group the intersecting cells by the shape they overlap
+        order = np.argsort(shape_idx, kind="stable")
+        shape_idx, cell_idx = shape_idx[order], cell_idx[order]
+        hit_idx, group_starts = np.unique(shape_idx, return_index=True)
+        cell_unions = [
+            shapely.union_all(cell_polygons[group])
+            for group in np.split(cell_idx, group_starts[1:])
+        ]
+        leftover[hit_idx] = shapely.difference(geoms[hit_idx], cell_unions)
 
-    # convert points to S2 cell IDs
-    s2_cell_id_list = points.geometry.apply(
-        lambda geom: lat_lon_to_cell_id(geom.y, geom.x, level)
+    leftover_shapes = gpd.GeoSeries(leftover, index=shapes.index, crs=shapes.crs)
+    return leftover_shapes[~shapely.is_empty(leftover)]
+
+
+def _get_s2_cells_overlapping_bounds(bounds, level) -> set[int]:
+    """
+    Find the S2 cells that overlap a set of bounding boxes, plus their neighbors.
+
+    Neighboring cells are included because the polygons from get_s2_cell_polygon have
+    straight edges in lat/lng, while the true S2 cell edges are geodesics, so a cell's
+    polygon can reach slightly past the cells S2 itself reports for a bounding box.
+
+    Parameters:
+    - bounds: Array of (min_x, min_y, max_x, max_y) bounding boxes in WGS84
+    - level: S2 cell level
+
+    Returns:
+    - set[int]: S2 cell IDs at the given level
+    """
+    # Most boxes (e.g. small PSUs) are much smaller than a cell. Such a box can
+    # only reach the cells holding its corners and their immediate neighbors, so
+    # those cells are found for all small boxes at once from the cell IDs of their
+    # corners. Boxes at least half a cell wide (in degrees, which overstates the
+    # distance in longitude away from the equator) go through S2's region coverer.
+    width = bounds[:, 2] - bounds[:, 0]
+    height = bounds[:, 3] - bounds[:, 1]
+    max_size = np.degrees(s2sphere.MIN_WIDTH.get_value(level)) / 2
+    is_small = np.hypot(width, height) < max_size
+
+    corners = bounds[is_small][:, [[0, 1], [2, 1], [2, 3], [0, 3]]]
+    corner_ids = _lat_lng_to_s2_cell_ids(
+        corners[..., 1].ravel(), corners[..., 0].ravel(), level
     )
-    s2_cell_ids = s2_cell_id_list.unique().tolist()
+    covering_cells = {
+        s2sphere.CellId(cell_id) for cell_id in np.unique(corner_ids).tolist()
+    }
+
+    coverer = s2sphere.RegionCoverer()
+    coverer.min_level = level
+    coverer.max_level = level
+    for min_x, min_y, max_x, max_y in set(map(tuple, bounds[~is_small].tolist())):
+        rect = s2sphere.LatLngRect.from_point_pair(
+            s2sphere.LatLng.from_degrees(min_y, min_x),
+            s2sphere.LatLng.from_degrees(max_y, max_x),
+        )
+        covering_cells.update(coverer.get_covering(rect))
+
+    # expand each distinct covering cell's neighbors only once
+    s2_cell_ids = {cell_id.id() for cell_id in covering_cells}
+    for cell_id in covering_cells:
+        s2_cell_ids.update(n.id() for n in cell_id.get_all_neighbors(level))
 
     return s2_cell_ids
 
@@ -45,10 +157,13 @@ def get_s2_cells_covering_geodataframe(gdf, level=6) -> list[int]:
     """
     Find all S2 cell IDs needed to fully cover the areas in a GeoDataFrame.
 
-    This function ensures complete spatial coverage by iteratively identifying S2 cells
-    until every part of every geometry in the GeoDataFrame is covered. It starts with
-    cells containing geometry centroids, then adds additional cells for any "spillover"
-    areas that extend beyond initial cell boundaries.
+    Candidate cells are found in one pass from the bounding box of every geometry:
+    small boxes contribute the cells of their corners, and larger ones are covered
+    with S2's region coverer. Only the candidates whose polygons overlap the
+    interior of at least one geometry are kept, so cells that merely touch a boundary
+    or fall in the empty corners of a bounding box are dropped. Geometries that lie
+    entirely on cell edges, such as a point on the corner of a cell, keep every cell
+    they touch.
 
     Useful for determining which S2-indexed data files need to be downloaded to cover
     a region of interest.
@@ -72,37 +187,46 @@ def get_s2_cells_covering_geodataframe(gdf, level=6) -> list[int]:
     """
 
     # check if crs is set to WGS84 (EPSG:4326)
-    if gdf.crs is None or gdf.crs.to_string() != "EPSG:4326":
+    if gdf.crs is None or not gdf.crs.equals("EPSG:4326"):
         raise ValueError("GeoDataFrame must be in WGS84 (EPSG:4326) CRS.")
 
-    # generate initial S2 cell IDs from the GeoDataFrame centroids
-    points = gdf.geometry.centroid.to_frame(name="geometry")
-    s2_cell_ids = get_s2_cells_containing_points(points, level=level)
-
-    # get initial S2 cell shapes and check for full coverage
-    s2_cell_shapes = get_s2_cell_polygons(s2_cell_ids)
-    leftover_shapes = gdf.difference(s2_cell_shapes.unary_union)
-    leftover_shapes = leftover_shapes[~leftover_shapes.is_empty]
-
-    print(f"Shapes with spillover after round 1: {len(leftover_shapes)}")
+    geoms = np.asarray(gdf.geometry.values)
+    geoms = geoms[~shapely.is_missing(geoms) & ~shapely.is_empty(geoms)]
 
-    step = 2
-    while len(leftover_shapes) > 0:
-        # get new s2 cell IDs from the leftover shapes
-        points_new = leftover_shapes.geometry.centroid.to_frame(name="geometry")
-        s2_cell_ids_new = get_s2_cells_containing_points(
-            points_new, level=level
+    # get candidate S2 cells from the bounding boxes of the geometries
+    candidate_ids = np.sort(
+        np.fromiter(
+            _get_s2_cells_overlapping_bounds(shapely.bounds(geoms), level),
+            dtype=np.uint64,
+        )
+    )
+    candidate_shapes = get_s2_cell_polygons(candidate_ids)
+    candidate_polygons = np.asarray(candidate_shapes.geometry.values)
+
+    # keep the cells that overlap a geometry, not just touch its edge. A geometry
+    # that overlaps no cell lies entirely on cell edges (e.g. a point on an edge or
+    # vertex), so it keeps every cell it touches instead.
+    tree = shapely.STRtree(candidate_polygons)
+    geom_idx, cell_idx = tree.query(geoms, predicate="intersects")
+    overlaps = ~shapely.touches(geoms[geom_idx], candidate_polygons[cell_idx])
+    has_overlap = np.zeros(len(geoms), dtype=bool)
+    has_overlap[geom_idx[overlaps]] = True
+    covering_idx = np.unique(cell_idx[overlaps | ~has_overlap[geom_idx]])
+    s2_cell_ids = candidate_ids[covering_idx].tolist()
+
+    # the candidates should always cover every geometry; warn rather than
+    # silently returning an incomplete set of cells if they don't
+    leftover_shapes = _subtract_s2_cells(
+        gpd.GeoSeries(geoms, crs=gdf.crs), candidate_shapes.iloc[covering_idx]
+    )
+    leftover_shapes = leftover_shapes[
+        shapely.area(leftover_shapes.values) >= _MIN_LEFTOVER_AREA
+    ]
+    if len(leftover_shapes) > 0:
+        warnings.warn(
+            f"{len(leftover_shapes)} geometries are not fully covered by the "
+            f"returned level {level} S2 cells.",
+            stacklevel=2,
         )
-
-        # get new s2 cell shapes
-        s2_cell_shapes = get_s2_cell_polygons(s2_cell_ids_new)
-        leftover_shapes = leftover_shapes.difference(s2_cell_shapes.unary_union)
-        leftover_shapes = leftover_shapes[~leftover_shapes.is_empty]
-
-        # add new s2 cell IDs to the existing list
-        s2_cell_ids = s2_cell_ids + s2_cell_ids_new
-
-        print(f"Shapes with spillover after round {step}: {len(leftover_shapes)}")
-        step += 1
 
     return s2_cell_ids
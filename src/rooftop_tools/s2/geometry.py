@@ -1,39 +1,215 @@
 """S2 cell geometry operations."""
 
+import functools
+
+import numpy as np
 import s2sphere
-from shapely.geometry import Polygon
+import shapely
 
+# s2sphere's tables mapping 8 bits of Hilbert curve position (plus orientation)
+# to 4 bits each of the i and j cell coordinates, and back
+_LOOKUP_IJ = np.array(s2sphere.LOOKUP_IJ, dtype=np.int64)
+_LOOKUP_POS = np.array(s2sphere.LOOKUP_POS, dtype=np.int64)
+_MAX_LEVEL = s2sphere.CellId.MAX_LEVEL
+_MAX_SIZE = 1 << _MAX_LEVEL
 
-def get_s2_cell_polygon(s2_cell_id):
+
+def _st_to_uv(s):
+    """Vectorized s2sphere.CellId.st_to_uv for the (default) quadratic projection."""
+    return np.where(
+        s >= 0.5,
+        (1.0 / 3.0) * (4 * s * s - 1),
+        (1.0 / 3.0) * (1 - 4 * (1 - s) * (1 - s)),
+    )
+
+
+def _to_s2_cell_id_array(s2_cell_ids) -> np.ndarray:
+    """Convert S2 cell IDs (ints, strings or numpy integers) to a uint64 array."""
+    if isinstance(s2_cell_ids, np.ndarray) and s2_cell_ids.dtype == np.uint64:
+        return s2_cell_ids
+    return np.array([int(s2_id) for s2_id in s2_cell_ids], dtype=np.uint64)
+
+
+def _uv_to_st(u):
+    """Vectorized s2sphere.CellId.uv_to_st for the (default) quadratic projection."""
+    return np.where(
+        u >= 0,
+        0.5 * np.sqrt(1 + 3 * np.abs(u)),
+        1 - 0.5 * np.sqrt(1 + 3 * np.abs(u)),
+    )
+
+
+def _lat_lng_to_s2_cell_ids(lat, lng, level) -> np.ndarray:
     """
-    Convert an S2 cell ID to a shapely polygon.
+    Find the S2 cell containing each of many lat/lng points at once.
+
+    This is a NumPy port of s2cell's lat_lon_to_cell_id, applied to whole arrays
+    instead of one point at a time, and returns the same cell IDs.
 
     Parameters:
-    - s2_cell_id (int): The S2 cell ID
+    - lat (np.ndarray): Latitudes in degrees
+    - lng (np.ndarray): Longitudes in degrees
+    - level (int): S2 cell level, from 0 to 30
 
     Returns:
-    - shapely.geometry.Polygon: Polygon representing the S2 cell
+    - np.ndarray: uint64 array of S2 cell IDs, one per point
+
+    Raises:
+    - ValueError: If the level is out of range or any coordinate is not finite
+    """
+    if not isinstance(level, int) or level < 0 or level > _MAX_LEVEL:
+        raise ValueError("S2 level must be integer >= 0 and <= 30")
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lng = np.radians(np.asarray(lng, dtype=np.float64))
+    if not (np.isfinite(lat).all() and np.isfinite(lng).all()):
+        raise ValueError("Cannot convert non-finite coordinates to S2 cell IDs")
+
+    # Project onto the unit sphere, then onto the cube face facing the point
+    # (the largest component of xyz, see s2cell._s2_xyz_to_face_uv)
+    xyz = np.stack(
+        [np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)], axis=1
+    )
+    rows = np.arange(len(xyz))
+    axis = np.argmax(np.abs(xyz), axis=1)
+    face = np.where(xyz[rows, axis] < 0, axis + 3, axis)
+    u = xyz[rows, 1 - ((face + 1) >> 1)] / xyz[rows, axis]
+    v = xyz[rows, 2 - (face >> 1)] / xyz[rows, axis]
+    u = np.where(np.isin(face, (1, 2, 5)), -u, u)
+    v = np.where(np.isin(face, (2, 4, 5)), -v, v)
+
+    # Quantize to leaf-level (i, j) coordinates on the face
+    i = np.clip(np.floor(_MAX_SIZE * _uv_to_st(u)), 0, _MAX_SIZE - 1).astype(np.int64)
+    j = np.clip(np.floor(_MAX_SIZE * _uv_to_st(v)), 0, _MAX_SIZE - 1).astype(np.int64)
+
+    # Encode (i, j) as a position along the Hilbert curve, 4 bits of each at a
+    # time (see s2cell.s2_face_ij_to_cell_id)
+    cell_ids = face.astype(np.uint64) << np.uint64(60)
+    bits = face & 1
+    for k in range(7, -1, -1):
+        bits = bits + (((i >> (k * 4)) & 15) << 6) + (((j >> (k * 4)) & 15) << 2)
+        bits = _LOOKUP_POS[bits]
+        cell_ids |= (bits >> 2).astype(np.uint64) << np.uint64(k * 8)
+        bits &= 3
+
+    # Shift in the trailing bit, then truncate the ID to the requested level
+    lsb = np.uint64(1 << (2 * (_MAX_LEVEL - level)))
+    return ((cell_ids << np.uint64(1)) & ~(lsb - np.uint64(1))) | lsb
+
+
+def _get_s2_cell_vertices(s2_cell_ids) -> np.ndarray:
+    """
+    Compute the corner coordinates of many S2 cells at once.
+
+    This is a NumPy port of s2sphere's Cell(CellId(id)).get_vertex(k) followed by
+    LatLng.from_point, applied to whole arrays instead of one cell at a time.
+
+    Parameters:
+    - s2_cell_ids (list): List of S2 cell IDs
+
+    Returns:
+    - np.ndarray: (N, 4, 2) array of (lng, lat) vertices in degrees, in the same
+                  counter-clockwise order as s2sphere
     """
-    # Convert string to int if necessary
-    if isinstance(s2_cell_id, str):
-        s2_cell_id = int(s2_cell_id)
+    ids = _to_s2_cell_id_array(s2_cell_ids)
+    face = (ids >> np.uint64(61)).astype(np.int64)
 
-    # Create an S2 cell from the ID
-    cell = s2sphere.CellId(s2_cell_id)
-    cell = s2sphere.Cell(cell)
+    # Decode the Hilbert curve position into leaf-level (i, j) coordinates on
+    # the face, one 8-bit chunk at a time (see CellId.to_face_ij_orientation)
+    i = np.zeros(len(ids), dtype=np.int64)
+    j = np.zeros(len(ids), dtype=np.int64)
+    bits = face & 1
+    for k in range(7, -1, -1):
+        nbits = _MAX_LEVEL - 28 if k == 7 else 4
+        chunk = (ids >> np.uint64(k * 8 + 1)) & np.uint64((1 << (2 * nbits)) - 1)
+        bits = _LOOKUP_IJ[bits + (chunk.astype(np.int64) << 2)]
+        i += (bits >> 6) << (k * 4)
+        j += ((bits >> 2) & 15) << (k * 4)
+        bits &= 3
 
-    # Extract the vertices of the cell
-    vertices = []
-    for i in range(4):
-        vertex = cell.get_vertex(i)
-        lat_lng = s2sphere.LatLng.from_point(vertex)
-        vertices.append((lat_lng.lng().degrees, lat_lng.lat().degrees))
+    # The lowest set bit of the ID encodes the cell level
+    lsb = ids & (~ids + np.uint64(1))
+    cell_size = np.int64(1) << (np.log2(lsb).astype(np.int64) >> 1)
 
-    # Close the polygon by repeating the first vertex
-    vertices.append(vertices[0])
+    # Cell bounds in (u, v) face coordinates
+    i_lo = i & -cell_size
+    j_lo = j & -cell_size
+    u_lo = _st_to_uv((1.0 / _MAX_SIZE) * i_lo)
+    u_hi = _st_to_uv((1.0 / _MAX_SIZE) * (i_lo + cell_size))
+    v_lo = _st_to_uv((1.0 / _MAX_SIZE) * j_lo)
+    v_hi = _st_to_uv((1.0 / _MAX_SIZE) * (j_lo + cell_size))
+    u = np.stack([u_lo, u_hi, u_hi, u_lo], axis=1)
+    v = np.stack([v_lo, v_lo, v_hi, v_hi], axis=1)
+
+    # Project (face, u, v) onto the unit sphere (see s2sphere.face_uv_to_xyz)
+    face = face[:, None]
+    ones = np.ones_like(u)
+    x = np.select(
+        [face == 0, face == 1, face == 2, face == 3, face == 4],
+        [ones, -u, -u, -ones, v],
+        v,
+    )
+    y = np.select(
+        [face == 0, face == 1, face == 2, face == 3, face == 4],
+        [u, ones, -v, -v, -ones],
+        u,
+    )
+    z = np.select(
+        [face == 0, face == 1, face == 2, face == 3, face == 4],
+        [v, v, ones, -u, -u],
+        -ones,
+    )
+    norm = 1.0 / np.sqrt(x * x + y * y + z * z)
+    x, y, z = x * norm, y * norm, z * norm
+
+    vertices = np.empty((len(ids), 4, 2), dtype=np.float64)
+    vertices[:, :, 0] = np.degrees(np.arctan2(y, x))
+    vertices[:, :, 1] = np.degrees(np.arctan2(z, np.sqrt(x * x + y * y)))
+    return vertices
+
+
+def _build_s2_cell_polygons(s2_cell_ids) -> np.ndarray:
+    """
+    Build shapely polygons for many S2 cells with a single shapely call.
+
+    Parameters:
+    - s2_cell_ids (list): List of S2 cell IDs
+
+    Returns:
+    - np.ndarray: Array of shapely polygons, one per S2 cell
+    """
+    # Fill a (cells, 5, 2) array of lng/lat vertices, then build all polygons
+    # at once instead of one Polygon per cell
+    vertices = np.empty((len(s2_cell_ids), 5, 2), dtype=np.float64)
+    vertices[:, :4, :] = _get_s2_cell_vertices(s2_cell_ids)
+
+    # Close each polygon by repeating its first vertex
+    vertices[:, 4, :] = vertices[:, 0, :]
+
+    return shapely.polygons(vertices)
 
-    # Create a shapely polygon
-    return Polygon(vertices)
+
+@functools.lru_cache(maxsize=1_000_000)
+def _get_cached_s2_cell_polygon(s2_cell_id: int):
+    """Memoized polygon for a single S2 cell ID, which must already be an int."""
+    return _build_s2_cell_polygons([s2_cell_id])[0]
+
+
+def get_s2_cell_polygon(s2_cell_id):
+    """
+    Convert an S2 cell ID to a shapely polygon.
+
+    Results are memoized, so repeated lookups of the same cell (e.g. once per
+    S2 file when matching rooftops) do not recompute the cell geometry.
+
+    Parameters:
+    - s2_cell_id (int): The S2 cell ID
+
+    Returns:
+    - shapely.geometry.Polygon: Polygon representing the S2 cell
+    """
+    # Convert string (or numpy integer) IDs to int, so that every form of the
+    # same ID shares one cache entry
+    return _get_cached_s2_cell_polygon(int(s2_cell_id))
 
 
 def get_s2_cell_polygons(s2_cell_ids):
@@ -41,17 +217,16 @@ def get_s2_cell_polygons(s2_cell_ids):
     Convert a list of S2 cell IDs to a GeoDataFrame with polygon geometries.
 
     Parameters:
-    - s2_cell_ids (list): List of S2 cell IDs
+    - s2_cell_ids (list | np.ndarray): List or array of S2 cell IDs
 
     Returns:
-    - geopandas.GeoDataFrame: GeoDataFrame with S2 cells as polygons
+    - geopandas.GeoDataFrame: GeoDataFrame with S2 cells as polygons, and their IDs
+                              in a uint64 s2_cell_id column
     """
     import geopandas as gpd
 
-    geometries = []
-    for s2_id in s2_cell_ids:
-        polygon = get_s2_cell_polygon(s2_id)
-        geometries.append(polygon)
+    s2_cell_ids = _to_s2_cell_id_array(s2_cell_ids)
+    geometries = gpd.GeoSeries(_build_s2_cell_polygons(s2_cell_ids), crs="EPSG:4326")
 
     return gpd.GeoDataFrame(
         {"s2_cell_id": s2_cell_ids, "geometry": geometries}, crs="EPSG:4326"
@@ -0,0 +1,112 @@
+"""Tests for the S2 cell coverage of geometries against a brute-force reference."""
+
+import warnings
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import Point, Polygon, box
+
+from rooftop_tools.s2.coverage import get_s2_cells_covering_geodataframe
+from rooftop_tools.s2.geometry import (
+    _lat_lng_to_s2_cell_ids,
+    get_s2_cell_polygon,
+    get_s2_cell_polygons,
+)
+
+LEVELS = [4, 6, 8]
+
+GEOMETRIES = {
+    "small_box": box(77.20, 28.60, 77.21, 28.61),
+    "village_boxes": shapely.MultiPolygon(
+        [box(120.98, 14.59, 120.99, 14.60), box(121.30, 14.10, 121.32, 14.13)]
+    ),
+    "state": box(74.0, 19.0, 80.0, 23.0),
+    "country": box(68.0, 6.0, 98.0, 36.0),
+    # Cells that hold a pole are not faithful polygons in lng/lat, so this stops
+    # short of the polar cells at level 4
+    "near_pole": box(10.0, 80.0, 40.0, 85.0),
+    "triangle": Polygon([(-10.0, -5.0), (5.0, -5.0), (-10.0, 12.0)]),
+}
+
+
+def _all_s2_cell_ids(level):
+    """Every S2 cell ID at a level, built from its face and position on the curve."""
+    positions = np.arange(4**level, dtype=np.uint64) << np.uint64(2 * (30 - level) + 1)
+    lsb = np.uint64(1 << (2 * (30 - level)))
+    return np.concatenate(
+        [(np.uint64(face) << np.uint64(61)) | positions | lsb for face in range(6)]
+    )
+
+
+def _brute_force_covering(geoms, level):
+    """The cells whose polygons overlap a geometry, checked against every cell."""
+    cells = get_s2_cell_polygons(_all_s2_cell_ids(level))
+    polygons = np.asarray(cells.geometry.values)
+    overlaps = np.zeros(len(polygons), dtype=bool)
+    for geom in geoms:
+        overlaps |= shapely.intersects(geom, polygons) & ~shapely.touches(
+            geom, polygons
+        )
+    return set(cells["s2_cell_id"][overlaps].tolist())
+
+
+def _wraps_antimeridian(s2_cell_id):
+    """Cells crossing the antimeridian become world-wide polygons in lng/lat."""
+    min_x, _, max_x, _ = get_s2_cell_polygon(s2_cell_id).bounds
+    return max_x - min_x > 180
+
+
+@pytest.mark.parametrize("level", LEVELS)
+@pytest.mark.parametrize("name", list(GEOMETRIES))
+def test_covering_matches_brute_force(name, level):
+    gdf = gpd.GeoDataFrame(geometry=[GEOMETRIES[name]], crs="EPSG:4326")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        s2_cell_ids = get_s2_cells_covering_geodataframe(gdf, level=level)
+
+    assert len(s2_cell_ids) == len(set(s2_cell_ids))
+    expected = _brute_force_covering(gdf.geometry, level)
+    assert {i for i in s2_cell_ids if not _wraps_antimeridian(i)} == {
+        i for i in expected if not _wraps_antimeridian(i)
+    }
+
+
+def test_covering_of_many_geometries_matches_brute_force():
+    gdf = gpd.GeoDataFrame(geometry=list(GEOMETRIES.values()), crs="EPSG:4326")
+
+    s2_cell_ids = get_s2_cells_covering_geodataframe(gdf, level=6)
+
+    expected = _brute_force_covering(gdf.geometry, 6)
+    assert {i for i in s2_cell_ids if not _wraps_antimeridian(i)} == {
+        i for i in expected if not _wraps_antimeridian(i)
+    }
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_point_on_cell_vertex_or_edge_keeps_touching_cells(level):
+    # the polygon of the cell holding Delhi, whose edges the neighboring cells share
+    cell = get_s2_cell_polygon(_lat_lng_to_s2_cell_ids([28.6], [77.2], level)[0])
+    vertex = Point(cell.exterior.coords[0])
+    edge_point = cell.exterior.interpolate(0.5, normalized=True)
+
+    for point in (vertex, edge_point):
+        gdf = gpd.GeoDataFrame(geometry=[point], crs="EPSG:4326")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            s2_cell_ids = get_s2_cells_covering_geodataframe(gdf, level=level)
+
+        polygons = get_s2_cell_polygons(s2_cell_ids).geometry
+        assert len(s2_cell_ids) > 0
+        assert polygons.intersects(point).all()
+
+
+def test_point_inside_cell_returns_its_cell():
+    gdf = gpd.GeoDataFrame(geometry=[Point(77.2, 28.6)], crs="EPSG:4326")
+
+    s2_cell_ids = get_s2_cells_covering_geodataframe(gdf, level=6)
+
+    assert len(s2_cell_ids) == 1
+    assert get_s2_cell_polygon(s2_cell_ids[0]).contains(Point(77.2, 28.6))
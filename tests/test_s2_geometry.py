@@ -0,0 +1,109 @@
+"""Tests for the NumPy S2 helpers against the s2sphere and s2cell reference code."""
+
+import numpy as np
+import pytest
+import s2sphere
+from s2cell.s2cell import lat_lon_to_cell_id
+
+from rooftop_tools.s2.geometry import _get_s2_cell_vertices, _lat_lng_to_s2_cell_ids
+
+LEVELS = [0, 1, 2, 3, 4, 5, 6, 7, 10, 13, 16, 20, 24, 27, 29, 30]
+
+# Poles, the antimeridian, the equator and the edges and corners of the cube faces
+# (faces meet at longitudes of +/-45 and +/-135 on the equator, and the cube
+# corners are at latitude +/-35.26 degrees)
+SPECIAL_LAT_LNGS = [
+    (0.0, 0.0),
+    (90.0, 0.0),
+    (-90.0, 0.0),
+    (89.999999, 123.4),
+    (-89.999999, -56.7),
+    (0.0, 180.0),
+    (0.0, -180.0),
+    (12.5, 179.999999),
+    (-12.5, -179.999999),
+    (0.0, 45.0),
+    (0.0, -45.0),
+    (0.0, 135.0),
+    (0.0, -135.0),
+    (45.0, 0.0),
+    (-45.0, 90.0),
+    (35.264389682754654, 45.0),
+    (-35.264389682754654, -135.0),
+    (28.6139, 77.209),  # New Delhi
+    (14.5995, 120.9842),  # Manila
+]
+
+
+def _lat_lngs(n=500, seed=42):
+    """Seeded random points on the sphere followed by the special points."""
+    rng = np.random.default_rng(seed)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lng = rng.uniform(-180, 180, n)
+    special_lat, special_lng = np.array(SPECIAL_LAT_LNGS).T
+    return np.concatenate([lat, special_lat]), np.concatenate([lng, special_lng])
+
+
+def _s2sphere_vertices(s2_cell_id):
+    cell = s2sphere.Cell(s2sphere.CellId(s2_cell_id))
+    vertices = []
+    for k in range(4):
+        lat_lng = s2sphere.LatLng.from_point(cell.get_vertex(k))
+        vertices.append((lat_lng.lng().degrees, lat_lng.lat().degrees))
+    return vertices
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_get_s2_cell_vertices_matches_s2sphere(level):
+    lat, lng = _lat_lngs()
+    s2_cell_ids = [
+        lat_lon_to_cell_id(y, x, level) for y, x in zip(lat.tolist(), lng.tolist())
+    ]
+
+    vertices = _get_s2_cell_vertices(s2_cell_ids)
+    expected = np.array([_s2sphere_vertices(s2_id) for s2_id in s2_cell_ids])
+
+    assert vertices.shape == (len(s2_cell_ids), 4, 2)
+    # longitudes of +180 and -180 are the same meridian
+    lng_diff = (vertices[..., 0] - expected[..., 0] + 180) % 360 - 180
+    np.testing.assert_allclose(lng_diff, 0, atol=1e-9)
+    np.testing.assert_allclose(vertices[..., 1], expected[..., 1], rtol=0, atol=1e-9)
+
+
+def test_get_s2_cell_vertices_accepts_strings_and_empty_input():
+    s2_cell_id = lat_lon_to_cell_id(28.6139, 77.209, 6)
+    np.testing.assert_array_equal(
+        _get_s2_cell_vertices([str(s2_cell_id)]), _get_s2_cell_vertices([s2_cell_id])
+    )
+    assert _get_s2_cell_vertices([]).shape == (0, 4, 2)
+
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_lat_lng_to_s2_cell_ids_matches_s2cell(level):
+    lat, lng = _lat_lngs()
+    expected = np.array(
+        [lat_lon_to_cell_id(y, x, level) for y, x in zip(lat.tolist(), lng.tolist())],
+        dtype=np.uint64,
+    )
+
+    s2_cell_ids = _lat_lng_to_s2_cell_ids(lat, lng, level)
+
+    assert s2_cell_ids.dtype == np.uint64
+    np.testing.assert_array_equal(s2_cell_ids, expected)
+
+
+def test_lat_lng_to_s2_cell_ids_empty_input():
+    s2_cell_ids = _lat_lng_to_s2_cell_ids(np.array([]), np.array([]), 6)
+    assert s2_cell_ids.dtype == np.uint64
+    assert len(s2_cell_ids) == 0
+
+
+@pytest.mark.parametrize("level", [-1, 31, 6.0])
+def test_lat_lng_to_s2_cell_ids_rejects_invalid_level(level):
+    with pytest.raises(ValueError):
+        _lat_lng_to_s2_cell_ids([0.0], [0.0], level)
+
+
+def test_lat_lng_to_s2_cell_ids_rejects_non_finite_coordinates():
+    with pytest.raises(ValueError):
+        _lat_lng_to_s2_cell_ids([np.nan], [0.0], 6)
@@ -0,0 +1,64 @@
+"""Tests for snapping points to roads, with the Roads API replaced by a fake."""
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely import Point
+
+from rooftop_tools.points import snapping
+
+
+@pytest.fixture
+def fake_roads_api(monkeypatch):
+    """Snap every point to itself shifted by 0.001 degrees, recording each request."""
+    requests_sent = []
+
+    def fake_snap(coords, api_key, session=None):
+        requests_sent.append(coords.copy())
+        return [Point(x + 0.001, y + 0.001) for x, y in coords.tolist()]
+
+    monkeypatch.setattr(snapping, "_snap_coordinates_to_road", fake_snap)
+    # The notebook progress bar needs ipywidgets, which tests don't run under
+    monkeypatch.setattr(snapping, "tqdm", lambda iterable, **kwargs: iterable)
+    snapping.clear_snap_cache()
+    yield requests_sent
+    snapping.clear_snap_cache()
+
+
+def test_non_finite_and_empty_points_resolve_to_none(fake_roads_api):
+    gdf = gpd.GeoDataFrame(
+        geometry=gpd.points_from_xy(
+            [77.2, np.nan, np.inf, 121.0, 10.0], [28.6, np.nan, 5.0, 14.6, -np.inf]
+        ),
+        crs="EPSG:4326",
+    )
+    gdf.loc[3, "geometry"] = Point()
+
+    snapped = snapping.get_nearest_points_on_road(gdf, api_key="test")
+
+    assert snapped.index.equals(gdf.index)
+    assert snapped.iloc[0].equals_exact(Point(77.201, 28.601), 1e-9)
+    assert snapped.iloc[1:].isna().all()
+    sent = np.concatenate(fake_roads_api)
+    assert np.isfinite(sent).all() and len(sent) == 1
+
+
+def test_api_call_skips_non_finite_and_empty_points(fake_roads_api):
+    points = [Point(np.nan, np.nan), Point(77.2, 28.6), Point(), Point(np.inf, 1.0)]
+
+    snapped = snapping.get_nearest_points_on_road_api_call(points, api_key="test")
+
+    assert snapped[1].equals_exact(Point(77.201, 28.601), 1e-9)
+    assert snapped[0] is None and snapped[2] is None and snapped[3] is None
+    assert len(fake_roads_api) == 1 and len(fake_roads_api[0]) == 1
+
+
+def test_all_points_non_finite(fake_roads_api):
+    gdf = gpd.GeoDataFrame(
+        geometry=gpd.points_from_xy([np.nan], [np.nan]), crs="EPSG:4326"
+    )
+
+    snapped = snapping.get_nearest_points_on_road(gdf, api_key="test")
+
+    assert snapped.isna().all()
+    assert fake_roads_api == []